@@ -5,14 +5,14 @@ Date Last Modified: 06/02/2026
 
 This program simulates the evolution of a human population over discrete
 time steps (each step representing 5 years). Individuals are modeled as
-agents stored in a CSV file and loaded into memory for each simulation
+agents stored in a Parquet file and loaded into memory for each simulation
 cycle. The system updates demographic characteristics such as age,
 fertility, partnerships, reproduction, and mortality, then persists the
 updated state back to disk.
 
 Core Features
 -------------
-- CSV-based persistent population storage
+- Parquet-based persistent population storage (with one-shot CSV migration)
 - Randomized initial population generation
 - Age progression across time steps
 - Age-dependent fertility activation and decline
@@ -23,25 +23,30 @@ Core Features
 
 Simulation Flow (Per Time Step)
 -------------------------------
-1. Load existing population from CSV (or generate an initial population).
+1. Load existing population from disk (or generate an initial population).
 2. Apply mortality rules based on age-dependent probabilities.
 3. Age all living individuals by one simulation interval (5 years).
 4. Update fertility status based on age thresholds.
 5. Identify single individuals and form new partnerships.
 6. Retrieve all current couples and simulate reproduction.
 7. Append newborn individuals to the population.
-8. Save the updated population back to the CSV file.
+8. Save the updated population back to the Parquet file.
 
 Data Representation
 -------------------
-Each individual is represented as a dictionary with the following fields:
+The population is a NumPy structured array (Structure-of-Arrays): one
+contiguous column per field instead of one dictionary per person. This
+lets every per-step update run as a vectorized NumPy expression over
+whole columns instead of a Python loop over agents. The Population
+wrapper keeps spare capacity so newborns append without reallocating
+every column each step. Fields:
     id               : Unique identifier
     sex              : 'M' or 'F'
     age              : Age in years
     alive            : 1 (alive) or 0 (deceased)
-    health           : Health score (0–100)
+    health           : Health score (0-100)
     fertility        : 1 (fertile) or 0 (infertile)
-    partner_id       : ID of current partner or -1 if single
+    partner_idx      : Row index of current partner or -1 if single
     children_count   : Number of children produced
 
 Purpose
@@ -51,109 +56,158 @@ framework suitable for experimentation with population growth,
 mortality/fertility parameters, and long-term demographic dynamics.
 """
 
-import random
-
-FILE_PATH = "simulation\\individual.csv"
+import atexit
+import os
+
+import numpy as np
+import polars as pl
+from numba import njit, prange
+
+FILE_PATH = "simulation/individual.parquet"
+LEGACY_CSV_PATH = "simulation\\individual.csv"
+
+# write a snapshot to disk only every this many steps; amortizes the
+# full-file rewrite over long runs (an atexit hook flushes the rest)
+BUFFER_STEPS = 20
+
+# one structured dtype describes a whole person; the array stores each
+# field as its own contiguous column
+PERSON_DTYPE = np.dtype([
+    ("id", "i8"),
+    ("sex", "U1"),
+    ("age", "i4"),
+    ("alive", "i1"),
+    ("health", "i2"),
+    ("fertility", "i1"),
+    ("partner_idx", "i8"),
+    ("children_count", "i4")
+])
+
+# Polars schema mirroring PERSON_DTYPE, used when migrating a legacy CSV
+# so the columns parse straight into the right types
+CSV_SCHEMA = {
+    "id": pl.Int64,
+    "sex": pl.Utf8,
+    "age": pl.Int32,
+    "alive": pl.Int8,
+    "health": pl.Int16,
+    "fertility": pl.Int8,
+    "partner_idx": pl.Int64,
+    "children_count": pl.Int32
+}
+
+# one PCG64 generator for the whole simulation; NumPy draws whole
+# arrays of randoms in C instead of one Python call per agent, PCG64
+# supports jumped substreams if kernels ever need their own, and a
+# single seed here makes an entire run reproducible
+SEED = None  # set to an int for reproducible runs
+rng = np.random.Generator(np.random.PCG64(SEED))
+
+# age-band mortality table: ages in [bands[k-1], bands[k]) die with
+# probability DEATH_PROBS[k] each step
+DEATH_BANDS = np.array([1, 15, 40, 55, 70, 85], dtype=np.int32)
+DEATH_PROBS = np.array([0.05, 0.01, 0.005, 0.02, 0.05, 0.15, 0.35])
 
 
 # --------------------------------------------------
-# Load population from CSV into memory
+# Population container
 # --------------------------------------------------
-def load_population():
-    population = []
+class Population:
+    """Structured-array agent store with spare capacity.
 
-    with open(FILE_PATH, "r") as f:
-        lines = f.readlines() # one big list as all the lines as elements
+    The backing array is kept larger than the live population and the
+    live length is tracked separately (vector-style), so appending
+    newborns is an amortized O(1) write into spare slots instead of a
+    full reallocate-and-copy of every column each step.
+    """
 
-    for line in lines[1:]:  # skip header
-        line = line.strip()  # remove '\n'
-        if line == "":      # remove empty lines (safety)
-            continue 
+    def __init__(self, people):
+        self._data = np.array(people, dtype=PERSON_DTYPE)
+        self.n = len(self._data)
+        self.cap = self.n
 
-        item = line.split(",") # a list for each line => item = ['0','M','33','1','73','1','8','0']
+    def __len__(self):
+        return self.n
 
-        # store the list items in the dictionary
-        person = {
-            "id": int(item[0]),
-            "sex": item[1],
-            "age": int(item[2]),
-            "alive": int(item[3]),
-            "health": int(item[4]),
-            "fertility": int(item[5]),
-            "partner_id": int(item[6]),
-            "children_count": int(item[7])
-        }
+    def view(self):
+        # the live rows; re-take after append, growth may reallocate
+        return self._data[:self.n]
 
-        # add the dictionary into the list => population = []
-        population.append(person)
+    def reserve(self, k):
+        # extend the live length by k slots (growing if needed) and
+        # return the view; the caller fills every reserved row
+        if self.n + k > self.cap:
+            self.cap = max(2 * self.cap, self.n + k)
+            self._data = np.resize(self._data, self.cap)
 
-    return population # (a list of multiple dictionaries)
+        self.n += k
+        return self._data[:self.n]
 
 
 # --------------------------------------------------
-# Save population back to CSV
+# Load population from disk into memory
+# --------------------------------------------------
+def load_population():
+    # Parquet stores the columns as typed binary, so loading is a single
+    # monolithic read with no number parsing at all
+    df = pl.read_parquet(FILE_PATH)
+
+    return Population(df.to_numpy(structured=True))
+
+
+# --------------------------------------------------
+# Save population back to disk
 # --------------------------------------------------
 def save_population(population):
-    # open file in write mode, clears old content
-    with open(FILE_PATH, "w") as f:
-        f.write("id,sex,age,alive,health,fertility,partner_id,children_count\n") # write header separately
+    # the Parquet writer does not create parent directories itself
+    os.makedirs(os.path.dirname(FILE_PATH), exist_ok=True)
+
+    # columnar binary write: no per-field string formatting, and zstd
+    # compression keeps the on-disk snapshots small
+    people = population.view()
+    df = pl.DataFrame({name: people[name] for name in PERSON_DTYPE.names})
+    df.write_parquet(FILE_PATH, compression="zstd")
 
-        # turn each dictionary values into a csv line (f-string)
-        for p in population:
-            line = f"{p['id']},{p['sex']},{p['age']},{p['alive']},{p['health']},{p['fertility']},{p['partner_id']},{p['children_count']}\n"
 
-            f.write(line)
+# --------------------------------------------------
+# One-shot migration from the old CSV storage
+# --------------------------------------------------
+def migrate_csv_to_parquet():
+    if os.path.exists(LEGACY_CSV_PATH) and not os.path.exists(FILE_PATH):
+        os.makedirs(os.path.dirname(FILE_PATH), exist_ok=True)
+        df = pl.read_csv(LEGACY_CSV_PATH, schema=CSV_SCHEMA)
+        df.write_parquet(FILE_PATH, compression="zstd")
 
 
 # --------------------------------------------------
 # Generate initial population
 # --------------------------------------------------
 def generate_initial_population():
-    population = []
-    next_id = 0
-
-    for i in range(10):
-        population.append({
-            "id": next_id,
-            "sex": "M",
-            "age": random.randint(18, 40),
-            "alive": 1,
-            "health": random.randint(70, 100),
-            "fertility": 1,
-            "partner_id": -1,
-            "children_count": 0
-        })
-        next_id += 1
-
-    for i in range(10):
-        population.append({
-            "id": next_id,
-            "sex": "F",
-            "age": random.randint(18, 40),
-            "alive": 1,
-            "health": random.randint(70, 100),
-            "fertility": 1,
-            "partner_id": -1,
-            "children_count": 0
-        })
-        next_id += 1
-
-    return population
+    population = np.zeros(20, dtype=PERSON_DTYPE)
+
+    population["id"] = np.arange(20)
+    population["sex"][:10] = "M"
+    population["sex"][10:] = "F"
+    population["age"] = rng.integers(18, 41, size=20)
+    population["alive"] = 1
+    population["health"] = rng.integers(70, 101, size=20)
+    population["fertility"] = 1
+    population["partner_idx"] = -1
+
+    return Population(population)
 
 
 # --------------------------------------------------
 # Get single men and women
 # --------------------------------------------------
 def get_single_people(population):
-    singleMen = []
-    singleWomen = []
+    people = population.view()
 
-    for p in population:
-        if p["alive"] == 1 and p["partner_id"] == -1:
-            if p["sex"] == "M":
-                singleMen.append(p)
-            elif p["sex"] == "F":
-                singleWomen.append(p)
+    # boolean masks over whole columns; results are arrays of row indices
+    single = (people["alive"] == 1) & (people["partner_idx"] == -1)
+
+    singleMen = np.where(single & (people["sex"] == "M"))[0]
+    singleWomen = np.where(single & (people["sex"] == "F"))[0]
 
     return singleMen, singleWomen
 
@@ -161,158 +215,169 @@ def get_single_people(population):
 # --------------------------------------------------
 # Pair men and women
 # --------------------------------------------------
-def pair_people(singleMen, singleWomen):
-    random.shuffle(singleMen)
-    random.shuffle(singleWomen)
-
-    pairs = []
-    count = min(len(singleMen), len(singleWomen))
-
-    for i in range(count):
-        pairs.append((singleMen[i], singleWomen[i]))
+def pair_people(population, singleMen, singleWomen):
+    people = population.view()
 
-    return pairs
+    # shuffle the index arrays in C, truncate to the shorter side, and
+    # write both partner columns with two fancy-index stores
+    rng.shuffle(singleMen)
+    rng.shuffle(singleWomen)
 
+    count = min(singleMen.size, singleWomen.size)
 
-# --------------------------------------------------
-# Apply pairing
-# --------------------------------------------------
-def apply_pairs(pairs):
-    for man, woman in pairs:
-        man["partner_id"] = woman["id"]
-        woman["partner_id"] = man["id"]
+    people["partner_idx"][singleMen[:count]] = singleWomen[:count]
+    people["partner_idx"][singleWomen[:count]] = singleMen[:count]
 
 # --------------------------------------------------
 # Get All Couples
 # --------------------------------------------------
 
 def get_all_couples(population):
-    couples = []
-    visited = set()
-
-    for p in population:
-        if p["partner_id"] != -1 and p["id"] not in visited:
-            partner = next(x for x in population if x["id"] == p["partner_id"])
-            couples.append((p, partner))
-            visited.add(p["id"])
-            visited.add(partner["id"])
+    # partner_idx points straight at the partner's row, so emitting each
+    # pair only from the lower-index side lists every couple exactly once
+    # with no lookups and no visited set
+    partner_idx = population.view()["partner_idx"]
+    first = np.where((partner_idx != -1)
+                     & (np.arange(len(population)) < partner_idx))[0]
 
-    return couples
+    return first, partner_idx[first]
 
 # --------------------------------------------------
 # Reproduction logic
 # --------------------------------------------------
-def reproduce(population, get_all_couples):
-    next_id = max(p["id"] for p in population) + 1   # generator expression: find max + 1 of all id's in population
-    new_children = []
-    
-    for man, woman in get_all_couples:
-        if man["alive"] == 1 and woman["alive"] == 1:
-            if man["fertility"] == 1 and woman["fertility"] == 1:
-                if random.random() < 0.5:  # 50 percent chance
-                    sex = "M" if random.randint(0, 1) == 1 else "F"   # ternary expression: 'A' if <condition == True> else 'B' 
-
-                    child = {
-                        "id": next_id,
-                        "sex": sex,
-                        "age": 0,
-                        "alive": 1,
-                        "health": random.randint(70, 100),
-                        "fertility": 0,
-                        "partner_id": -1,
-                        "children_count": 0
-                    }
-
-                    man["children_count"] += 1
-                    woman["children_count"] += 1
-
-                    new_children.append(child)
-                    next_id += 1
-
-    population.extend(new_children)
+@njit(parallel=True, fastmath=True, cache=True)
+def _births_kernel(m_idx, w_idx, alive, fertility, children_count,
+                   r_birth, births):
+    # pass 1: decide every couple in parallel and bump the parents'
+    # child counts; each person sits in at most one couple, so the
+    # increments never race
+    for c in prange(m_idx.size):
+        m = m_idx[c]
+        w = w_idx[c]
+
+        if (alive[m] == 1 and alive[w] == 1
+                and fertility[m] == 1 and fertility[w] == 1
+                and r_birth[c] < 0.5):  # 50 percent chance
+            births[c] = 1
+            children_count[m] += 1
+            children_count[w] += 1
+        else:
+            births[c] = 0
+
+
+@njit(parallel=True, fastmath=True, cache=True)
+def _fill_children_kernel(births, offsets, old_n, id_col, age, alive,
+                          health, fertility, partner_idx, children_count,
+                          r_health):
+    # pass 2: the prefix sum gives every newborn its own slot (and id,
+    # since ids equal row indices), so the fills are race-free
+    for c in prange(births.size):
+        if births[c] == 1:
+            slot = old_n + offsets[c] - 1
+            id_col[slot] = slot
+            age[slot] = 0
+            alive[slot] = 1
+            health[slot] = r_health[c]
+            fertility[slot] = 0
+            partner_idx[slot] = -1
+            children_count[slot] = 0
+
+
+def reproduce(population, all_couples, r_birth, r_sex):
+    m_idx, w_idx = all_couples
+    people = population.view()
+    old_n = len(population)
+
+    births = np.empty(m_idx.size, dtype=np.int8)
+    _births_kernel(m_idx, w_idx, people["alive"], people["fertility"],
+                   people["children_count"], r_birth, births)
+
+    # serial prefix sum turns the birth flags into output slots; this
+    # removes the serial next_id += 1 dependency from the parallel pass
+    offsets = np.cumsum(births, dtype=np.int64)
+    n_children = int(offsets[-1]) if offsets.size else 0
+    if n_children == 0:
+        return
+
+    r_health = rng.integers(70, 101, size=m_idx.size)
+
+    # grows into spare capacity; amortized O(1) instead of a full copy
+    people = population.reserve(n_children)
+    _fill_children_kernel(births, offsets, old_n, people["id"],
+                          people["age"], people["alive"], people["health"],
+                          people["fertility"], people["partner_idx"],
+                          people["children_count"], r_health)
+
+    # sex is a unicode column, so it is filled outside the nopython pass
+    people["sex"][old_n:] = np.where(r_sex[births == 1] == 1, "M", "F")
 
 
 # --------------------------------------------------
-# Aging logic
+# Fused step update: death, aging and fertility
 # --------------------------------------------------
-def aging_update(population):
-    for p in population:
-        if p["alive"] == 1:     # only age if alive
-            p["age"] += 5
+@njit(parallel=True, fastmath=True, cache=True)
+def _step_kernel(age, alive, fertility, r_death, bands, probs):
+    # one visit per agent for all three updates, so each row's fields
+    # stay in cache instead of three full passes over the columns
+    for i in prange(age.size):
+        if alive[i] == 0:
+            continue
+
+        # same banding as np.searchsorted(bands, age, side="right"),
+        # fused with the compare so no temporary arrays are built
+        band = 0
+        while band < bands.size and age[i] >= bands[band]:
+            band += 1
+        if r_death[i] < probs[band]:
+            alive[i] = 0
+            continue
+
+        age[i] += 5  # only age if alive
+
+        if age[i] > 18 and fertility[i] == 0:
+            fertility[i] = 1
+
+        if age[i] > 65:
+            fertility[i] = 0
+
+
+def step_update(population, r_death):
+    # randoms are pre-drawn in one batch per step; Numba's own RNG
+    # inside prange would need per-thread state to stay reproducible
+    people = population.view()
+    _step_kernel(people["age"], people["alive"], people["fertility"],
+                 r_death, DEATH_BANDS, DEATH_PROBS)
 
-# --------------------------------------------------
-# Death logic
-# --------------------------------------------------
-def death(population):
-    for p in population:
-        if p["age"] < 1:
-            death_prob = random.random()
-            if death_prob < 0.05:
-                p["alive"] = 0
-        if p["age"] < 15 and p["age"] > 1:
-            death_prob = random.random()
-            if death_prob < 0.01:
-                p["alive"] = 0
-        elif p["age"] < 40 and p["age"] > 15:
-            death_prob = random.random()
-            if death_prob < 0.005:
-                p["alive"] = 0
-        elif p["age"] < 55 and p["age"] > 40:
-            death_prob = random.random()
-            if death_prob < 0.02:
-                p["alive"] = 0
-        elif p["age"] < 70 and p["age"] > 55:
-            death_prob = random.random()
-            if death_prob < 0.05:
-                p["alive"] = 0
-        elif p["age"] < 85 and p["age"] > 70:
-            death_prob = random.random()
-            if death_prob < 0.15:
-                p["alive"] = 0
-        elif p["age"] >= 85:
-            death_prob = random.random()
-            if death_prob < 0.35:
-                p["alive"] = 0
-        
 # --------------------------------------------------
 # Population Counter
 # --------------------------------------------------
 def census(population):
-        census = 0
-        for p in population:
-            if p["alive"] == 1:
-                census += 1
-        
-        return census
+    # alive is int8 holding only 0/1, so the count is a straight SIMD
+    # reduction with no temporary comparison array
+    return int(population.view()["alive"].sum())
 
-# --------------------------------------------------
-# Update Fertility
-# --------------------------------------------------
-def fertility_update(population):
-    for p in population:
-        if p["age"] > 18 and p["fertility"] == 0:
-            p["fertility"] = 1
-
-        if p["age"] > 65:
-            p["fertility"] = 0
-        
 # --------------------------------------------------
 # MAIN DRIVER
 # --------------------------------------------------
 def main():
     year = 0
+    steps_since_save = 0
 
-    while True:
-        try:
-            population = load_population()
-            if len(population) == 0:
-                raise FileNotFoundError
-        except:
-            population = generate_initial_population()
-            save_population(population)
+    migrate_csv_to_parquet()
 
+    try:
+        population = load_population()
+        if len(population) == 0:
+            raise FileNotFoundError
+    except:
+        population = generate_initial_population()
+        save_population(population)
 
+    # population now lives in memory across steps, so make sure whatever
+    # state the run ends with (Ctrl+C included) reaches the disk
+    atexit.register(lambda: save_population(population))
 
+    while True:
         print("=== Step DATA ===")
         print("Year: ", year)
         tot = census(population)
@@ -322,18 +387,23 @@ def main():
 
 
         if inp == "":
-            death(population)
-            aging_update(population)
-            fertility_update(population)
+            # every random the step needs is drawn in batches up front
+            r_death = rng.random(len(population))
+            step_update(population, r_death)
             men, women = get_single_people(population)
-            pairs = pair_people(men, women)
-            apply_pairs(pairs)
+            pair_people(population, men, women)
 
             all_couples = get_all_couples(population)
-            reproduce(population, all_couples)
+            n_couples = all_couples[0].size
+            r_birth = rng.random(n_couples)
+            r_sex = rng.integers(0, 2, size=n_couples)
+            reproduce(population, all_couples, r_birth, r_sex)
 
             year += 5
-            save_population(population)
+            steps_since_save += 1
+            if steps_since_save >= BUFFER_STEPS:
+                save_population(population)
+                steps_since_save = 0
             print("Simulation step complete")
 
 
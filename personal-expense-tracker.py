@@ -8,38 +8,34 @@ Data Storage: All expense data is persisted in 'personalExpense.csv' with column
 
 """
 
-FILE_PATH = "personalExpense.csv"
-
-def loadData():
-    data = []
+from datetime import datetime
 
-    with open(FILE_PATH, "r") as f:
-        lines = f.readlines()
+import polars as pl
 
-    for line in lines[1:]:
-        line = line.strip()
-        entry = line.split(",")
+FILE_PATH = "personalExpense.csv"
 
-        dataItem = {
-            "index": int(entry[0]),
-            "date" : str(entry[1]),
-            "category": str(entry[2]),
-            "amount": float(entry[3])
-        }
+# fixed column types so Polars parses the file without guessing; dates
+# stay strings because they are entered and shown as DD-MM-YYYY
+EXPENSE_SCHEMA = {
+    "index": pl.Int64,
+    "date": pl.Utf8,
+    "category": pl.Utf8,
+    "amount": pl.Float64
+}
 
-        data.append(dataItem)
+def loadData():
+    # Polars parses the whole CSV in Rust; keying the records by their
+    # index makes every remove/edit an O(1) dict operation instead of a
+    # scan over the whole list
+    df = pl.read_csv(FILE_PATH, schema=EXPENSE_SCHEMA)
 
-    return data
+    return {d["index"]: d for d in df.to_dicts()}
 
 def saveData(data):
-    with open(FILE_PATH, "w") as f:
-        f.write("index,date,category,amount")
-        f.write('\n')
+    # the schema keeps the header and column order stable even when the
+    # expense dict is empty
+    pl.DataFrame(list(data.values()), schema=EXPENSE_SCHEMA).write_csv(FILE_PATH)
 
-        for d in data:
-            line = f"{d['index']},{d['date']},{d['category']},{d['amount']}\n"
-            f.write(line)
-    
 
 def show_menu():
     print("MENU")
@@ -56,6 +52,18 @@ def get_choice():
     return choice
 
 
+# menu positions 1-8 map straight onto this tuple
+CATEGORIES = (
+    'housing_and_utilities',
+    'food',
+    'transportation',
+    'health',
+    'family_care',
+    'entertainment',
+    'emi_or_loans',
+    'miscellaneous'
+)
+
 def print_all_categories():
     print("1-Housing And Utilities")
     print("2-Food")
@@ -67,48 +75,28 @@ def print_all_categories():
     print("8-Misc")
 
 def get_cat_from_int(categoryInt):
-    if categoryInt == 1:
-        cat = 'housing_and_utilities'
-    elif categoryInt == 2:
-        cat = 'food'
-    elif categoryInt == 3:
-        cat = 'transportation'
-    elif categoryInt == 4:
-        cat = 'health'
-    elif categoryInt == 5:
-        cat = 'family_care'
-    elif categoryInt == 6:
-        cat = 'entertainment'
-    elif categoryInt == 7:
-        cat = 'emi_or_loans'
-    elif categoryInt == 8:
-        cat = 'miscellaneous'
-
-    return cat
+    # guard before indexing: 0 or negatives would otherwise wrap around
+    # to the wrong category instead of failing
+    if not 1 <= categoryInt <= len(CATEGORIES):
+        raise ValueError("Category must be between 1 and 8")
+
+    return CATEGORIES[categoryInt - 1]
 
 def add_expense(data):
     valid = 0
     while not valid:
         date = str(input("Enter the date (DD-MM-YYYY): "))
-        date_pieces = date.split("-")
-        if (31 >= int(date_pieces[0]) >= 1) is False:
-            valid = 0
-            print("Invalid Date! Enter again...")
-            continue
-        elif (12 >= int(date_pieces[1]) >= 1) is False:
-            valid = 0
-            print("Invalid Date! Enter again...")
-            continue
-        elif (9999 >= int(date_pieces[2]) >= 2000) is False:
-            valid = 0
-            print("Invalid Date! Enter again...")
-            continue
-        elif len(date) != 10:
-            valid = 0
+        # strptime parses and calendar-validates in one call, so
+        # impossible dates like 30-02 are rejected too; the length
+        # check keeps the stored format zero-padded
+        try:
+            parsed = datetime.strptime(date, "%d-%m-%Y")
+            if len(date) != 10 or parsed.year < 2000:
+                raise ValueError
+            valid = 1
+        except ValueError:
             print("Invalid Date! Enter again...")
             continue
-        else:
-            valid = 1
 
 
     print_all_categories()
@@ -126,46 +114,44 @@ def add_expense(data):
             amount_valid = 1
 
 
-    next_index = max((d["index"] for d in data), default = 0) + 1
+    next_index = max(data, default = 0) + 1
 
-    data.append({
+    data[next_index] = {
         "index": int(next_index),
         "date": str(date),
         "category": str(cat),
         "amount":float(amount)
-    })
+    }
 
     return data
 
 def remove_expense(data):
     index = int(input("Enter the index to remove expense: "))
-    for d in data:
-        if int(d['index']) == index:
-            data.remove(d)
-            print("Expense deleted! ")
-            return
-    print("Expense not found!")
-        
+    if data.pop(index, None) is not None:
+        print("Expense deleted! ")
+    else:
+        print("Expense not found!")
+
 
 def edit_expense(data):
     edit_index = int(input("Enter the index to edit the expense: "))
-    for d in data:
-        if int(d['index']) == edit_index:
-            option = int(input("What do you want to edit? (1-date, 2-category, 3-amount): "))
-            if option == 1:
-                new_date = input("Enter new date: ")
-                d['date'] = new_date
-                print("Date Updated! ")
-            elif option == 2:
-                print_all_categories()
-                new_cat_int = int(input("Enter new Category: "))
-                new_cat_str = get_cat_from_int(new_cat_int)
-                d['category'] = new_cat_str
-                print("Category Updated! ")
-            elif option == 3:
-                new_amount = float(input("Enter new amount: "))
-                d['amount'] = new_amount
-                print("Amount Updated! ")
+    d = data.get(edit_index)
+    if d is not None:
+        option = int(input("What do you want to edit? (1-date, 2-category, 3-amount): "))
+        if option == 1:
+            new_date = input("Enter new date: ")
+            d['date'] = new_date
+            print("Date Updated! ")
+        elif option == 2:
+            print_all_categories()
+            new_cat_int = int(input("Enter new Category: "))
+            new_cat_str = get_cat_from_int(new_cat_int)
+            d['category'] = new_cat_str
+            print("Category Updated! ")
+        elif option == 3:
+            new_amount = float(input("Enter new amount: "))
+            d['amount'] = new_amount
+            print("Amount Updated! ")
 
 def view_all_expenses(data):
     total_money_spent = 0
@@ -173,8 +159,9 @@ def view_all_expenses(data):
     print("="*85)
     print("%-10s | %-15s | %-30s | %-15s"% ("Index", "Date", "Category", "Amount"))
     print("="*85)
-    for d in data:
-        total_money_spent = total_money_spent + float(d["amount"])
+    for d in data.values():
+        # amounts are already floats from loadData; no re-parsing needed
+        total_money_spent = total_money_spent + d["amount"]
         print("%-10d | %-15s | %-30s | %-15.2f" % (d["index"], d["date"], d["category"], d["amount"]))
     print("="*85)
     print("Total Money Spent: %53.2f" % total_money_spent)
@@ -187,42 +174,25 @@ def view_grouped_expenses(data):
     print("="*85)
     print("%-10s | %-15s | %-30s | %-15s"% ("Index", "Date", "Category", "Amount"))
     print("="*85)
-    for d in data:
+    for d in data.values():
         if d['category'] == cat:
-            total_money_spent = total_money_spent + float(d["amount"])
+            total_money_spent = total_money_spent + d["amount"]
             print("%-10d | %-15s | %-30s | %-15.2f" % (d["index"], d["date"], d["category"], d["amount"]))
     print("="*85)
     print("Total Money Spent on %-15s: %30.2f" % (cat, total_money_spent))
 
 def calculate_total_spending(data):
-    category_totals = {
-        "housing_and_utilities": 0,
-        "food":0,
-        "transportation":0,
-        "health":0,
-        "family_care":0,
-        "entertainment":0,
-        "emi_or_loans":0,
-        "miscellaneous":0
-    }
+    # start every category at zero so empty ones still show in the report
+    category_totals = dict.fromkeys(CATEGORIES, 0)
+
+    if data:
+        # hash-based aggregation in Rust instead of an 8-way if/elif
+        # ladder per expense
+        totals = pl.DataFrame(list(data.values()), schema=EXPENSE_SCHEMA) \
+                   .group_by("category") \
+                   .agg(pl.col("amount").sum())
 
-    for d in data:
-        if d["category"] == "housing_and_utilities":
-            category_totals["housing_and_utilities"] += d["amount"]
-        elif d["category"] == "food":
-            category_totals["food"] += d["amount"]
-        elif d["category"] == "transportation":
-            category_totals["transportation"] += d["amount"]
-        elif d["category"] == "health":
-            category_totals["health"] += d["amount"]
-        elif d["category"] == "family_care":
-            category_totals["family_care"] += d["amount"]
-        elif d["category"] == "entertainment":
-            category_totals["entertainment"] += d["amount"]
-        elif d["category"] == "emi_or_loans":
-            category_totals["emi_or_loans"] += d["amount"]
-        elif d["category"] == "miscellaneous":
-            category_totals["miscellaneous"] += d["amount"]
+        category_totals.update(zip(totals["category"], totals["amount"]))
 
     return category_totals
 